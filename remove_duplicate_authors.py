@@ -1,22 +1,225 @@
-import json
-import requests
+import asyncio
+import atexit
+import os
+import queue
+import random
+import sqlite3
 import time
-from typing import Dict, List, Set
+import aiohttp
+import ijson
+import orjson
+from typing import Dict, List, Mapping, NamedTuple, Optional, Set
 import logging
+from logging.handlers import QueueHandler, QueueListener
+from collections import deque
 from datetime import datetime
+from email.utils import parsedate_to_datetime
+from pathlib import Path
+from urllib.parse import urlsplit
 
-# Configure logging
+# Configure logging. Records are only queued on the calling thread; a
+# background listener thread writes them to the log file and console, so
+# disk writes never block the event loop.
+log_queue = queue.Queue(-1)
+log_listener = QueueListener(
+    log_queue,
+    logging.FileHandler(f'bot_run_{datetime.now().strftime("%Y%m%d_%H%M%S")}.log'),
+    logging.StreamHandler()
+)
 logging.basicConfig(
     level=logging.INFO,
     format='%(asctime)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler(f'bot_run_{datetime.now().strftime("%Y%m%d_%H%M%S")}.log'),
-        logging.StreamHandler()
-    ]
+    handlers=[QueueHandler(log_queue)]
 )
+log_listener.start()
+atexit.register(log_listener.stop)
+
+# Retry policy for throttled requests and server errors
+MAX_RETRIES = 5
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+# Number of works fetched per /api/get_many request
+BATCH_SIZE = 50
+
+
+class HTTPResult(NamedTuple):
+    """Status, headers and fully read body of a response."""
+    status: int
+    headers: Mapping[str, str]
+    body: bytes
+    
+    def raise_for_status(self):
+        """Raise aiohttp.ClientError for 4xx and 5xx statuses."""
+        if self.status >= 400:
+            raise aiohttp.ClientError(f"HTTP {self.status}")
+    
+    def text(self) -> str:
+        """Return the body decoded as UTF-8."""
+        return self.body.decode('utf-8', errors='replace')
+
+
+class AdaptiveLimiter:
+    """
+    Per-host request limiter driven by rate limit response headers.
+    
+    Each host gets a semaphore bounding in-flight requests and a deadline
+    before which no new request may start. `Retry-After` pushes the deadline
+    back, while `X-RateLimit-Remaining` and `X-RateLimit-Reset` spread the
+    remaining request budget evenly over the current window.
+    """
+    
+    def __init__(self, max_concurrent: int = 10):
+        """
+        Initialize the limiter.
+        
+        Args:
+            max_concurrent: Maximum number of in-flight requests per host
+        """
+        self.max_concurrent = max_concurrent
+        self._semaphores: Dict[str, asyncio.Semaphore] = {}
+        self._deadlines: Dict[str, float] = {}
+        self._intervals: Dict[str, float] = {}
+    
+    async def acquire(self, host: str):
+        """Wait for a free slot for `host` and for its deadline to pass."""
+        semaphore = self._semaphores.get(host)
+        if semaphore is None:
+            semaphore = self._semaphores[host] = asyncio.Semaphore(self.max_concurrent)
+        await semaphore.acquire()
+        
+        now = asyncio.get_running_loop().time()
+        start = max(now, self._deadlines.get(host, 0.0))
+        # Reserve our start time so concurrent callers queue up behind it
+        self._deadlines[host] = start + self._intervals.get(host, 0.0)
+        if start > now:
+            try:
+                await asyncio.sleep(start - now)
+            except asyncio.CancelledError:
+                # The caller never gets the slot, so it will not release it
+                semaphore.release()
+                raise
+    
+    def release(self, host: str):
+        """Free the slot taken by `acquire`."""
+        self._semaphores[host].release()
+    
+    def update(self, host: str, headers) -> None:
+        """
+        Adjust the pacing for `host` from a response's rate limit headers.
+        
+        Args:
+            host: Host the response came from
+            headers: Response headers
+        """
+        now = asyncio.get_running_loop().time()
+        deadline = self._deadlines.get(host, 0.0)
+        
+        retry_after = self._parse_retry_after(headers.get('Retry-After'))
+        if retry_after is not None:
+            deadline = max(deadline, now + retry_after)
+        
+        remaining = headers.get('X-RateLimit-Remaining')
+        reset = headers.get('X-RateLimit-Reset')
+        if remaining is not None and reset is not None:
+            try:
+                remaining = int(float(remaining))
+                reset_in = float(reset)
+            except ValueError:
+                remaining = None
+            if remaining is not None:
+                # Some servers send an epoch timestamp rather than seconds
+                if reset_in > 1e9:
+                    reset_in -= time.time()
+                reset_in = max(reset_in, 0.0)
+                if remaining <= 0:
+                    deadline = max(deadline, now + reset_in)
+                else:
+                    self._intervals[host] = reset_in / remaining
+        
+        self._deadlines[host] = deadline
+    
+    @staticmethod
+    def _parse_retry_after(value: Optional[str]) -> Optional[float]:
+        """Parse a `Retry-After` header given either in seconds or as an HTTP date."""
+        if not value:
+            return None
+        try:
+            return max(float(value), 0.0)
+        except ValueError:
+            pass
+        try:
+            return max(parsedate_to_datetime(value).timestamp() - time.time(), 0.0)
+        except (TypeError, ValueError):
+            return None
+
+
+class WorkCache:
+    """
+    SQLite cache of fetched work documents, kept on disk across runs.
+    
+    Entries are keyed by work ID (without /works/ prefix) rather than by
+    URL, so a work fetched through /api/get_many can be served to any later
+    batch or single-work lookup, and dropped individually once edited.
+    
+    Writes are not committed one by one; callers call `commit` once per
+    batch of works, and `close` commits whatever is still pending.
+    """
+    
+    def __init__(self, path: str, expire_after: float = 86400):
+        """
+        Open (or create) the cache database and drop its expired entries.
+        
+        Args:
+            path: Path to the SQLite database file
+            expire_after: Seconds after which a cached work is ignored
+        """
+        self.path = path
+        self.expire_after = expire_after
+        self._conn = sqlite3.connect(path)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS works ("
+            "work_id TEXT PRIMARY KEY, fetched_at REAL NOT NULL, data BLOB NOT NULL)"
+        )
+        # Expired entries are never served again, so do not let them pile up
+        self._conn.execute("DELETE FROM works WHERE fetched_at < ?", (time.time() - self.expire_after,))
+        self._conn.commit()
+    
+    def get_many(self, work_ids: List[str]) -> Dict[str, Dict]:
+        """Return the unexpired cached works among `work_ids`, keyed by work ID."""
+        if not work_ids:
+            return {}
+        placeholders = ','.join('?' * len(work_ids))
+        rows = self._conn.execute(
+            f"SELECT work_id, data FROM works WHERE fetched_at >= ? AND work_id IN ({placeholders})",
+            [time.time() - self.expire_after, *work_ids]
+        )
+        return {work_id: orjson.loads(data) for work_id, data in rows}
+    
+    def put_many(self, works: Dict[str, Dict]):
+        """Store fetched works, keyed by work ID."""
+        now = time.time()
+        self._conn.executemany(
+            "INSERT OR REPLACE INTO works (work_id, fetched_at, data) VALUES (?, ?, ?)",
+            [(work_id, now, orjson.dumps(work_data)) for work_id, work_data in works.items()]
+        )
+    
+    def delete(self, work_id: str):
+        """Drop a work from the cache, e.g. after it was edited."""
+        self._conn.execute("DELETE FROM works WHERE work_id = ?", (work_id,))
+    
+    def commit(self):
+        """Write the pending puts and deletes to disk."""
+        self._conn.commit()
+    
+    def close(self):
+        """Commit pending writes and close the database connection."""
+        self._conn.commit()
+        self._conn.close()
+
 
 class OpenLibraryBot:
-    def __init__(self, username: str, password: str, dry_run: bool = True):
+    def __init__(self, username: str, password: str, dry_run: bool = True, concurrency: int = 10,
+                 cache_file: Optional[str] = None, done_file: Optional[str] = None):
         """
         Initialize the Open Library bot.
         
@@ -24,12 +227,37 @@ class OpenLibraryBot:
             username: Bot account username
             password: Bot account password
             dry_run: If True, only simulate changes without actually updating
+            concurrency: Number of queue workers, each handling a batch of up to BATCH_SIZE
+                works, and the maximum number of in-flight requests per host
+            cache_file: SQLite file caching fetched works across runs (None = no disk cache)
+            done_file: File recording updated work IDs, which later runs skip (None = no checkpoint)
         """
         self.username = username
         self.password = password
         self.dry_run = dry_run
+        self.concurrency = concurrency
         self.base_url = "https://openlibrary.org"
-        self.session = requests.Session()
+        self.client = None  # aiohttp.ClientSession shared by login and all edits
+        self.limiter = AdaptiveLimiter(max_concurrent=concurrency)
+        self.done_file = done_file
+        self._done_fh = None  # done_file opened for appending during a live run
+        
+        # Number of works taken up by the workers so far
+        self._processed = 0
+        
+        # Cleared lists and sets reused as scratch space by remove_duplicate_authors
+        self._list_pool: deque = deque(maxlen=64)
+        self._set_pool: deque = deque(maxlen=64)
+        
+        # Work URLs by ID, built once per work and shared by its GET and PUT
+        self._url_cache: Dict[str, str] = {}
+        
+        # Fetches in progress by work ID, so concurrent lookups can share them
+        self._inflight: Dict[str, asyncio.Future] = {}
+        
+        # Works cached by earlier runs, and which of the fetched ones came from there
+        self.disk_cache = WorkCache(cache_file) if cache_file else None
+        self._from_disk: Set[str] = set()
         self.logged_in = False
         
         # Statistics
@@ -41,9 +269,59 @@ class OpenLibraryBot:
             'authors_removed': 0
         }
     
-    def login(self) -> bool:
+    @staticmethod
+    def _norm_id(work_id: str) -> str:
+        """Strip the /works/ prefix from a work ID or key, if present."""
+        return work_id[len('/works/'):] if work_id.startswith('/works/') else work_id
+    
+    def _work_url(self, work_id: str) -> str:
+        """Return the JSON URL of a work, given its ID without /works/ prefix."""
+        url = self._url_cache.get(work_id)
+        if url is None:
+            url = self._url_cache[work_id] = f"{self.base_url}/works/{work_id}.json"
+        return url
+    
+    def _ensure_client(self) -> aiohttp.ClientSession:
+        """
+        Create the shared HTTP session on first use.
+        
+        Login, fetches and updates all go through this one session, so its
+        cookie jar carries the login and its keep-alive pool reuses the same
+        TLS connections for every request instead of handshaking per request.
+        """
+        if self.client is None or self.client.closed:
+            # Cache openlibrary.org's DNS lookup and keep idle connections warm
+            connector = aiohttp.TCPConnector(
+                limit=0,
+                limit_per_host=32,
+                use_dns_cache=True,
+                ttl_dns_cache=300,
+                keepalive_timeout=60
+            )
+            self.client = aiohttp.ClientSession(connector=connector, trust_env=True)
+        return self.client
+    
+    async def __aenter__(self) -> 'OpenLibraryBot':
+        """Open the shared HTTP session for the duration of an `async with` block."""
+        self._ensure_client()
+        return self
+    
+    async def __aexit__(self, exc_type, exc, tb):
+        """Close the shared HTTP session and the disk cache."""
+        await self.close()
+    
+    async def close(self):
+        """Close the shared HTTP session, its pooled connections and the disk cache."""
+        if self.client is not None:
+            await self.client.close()
+            self.client = None
+        if self.disk_cache is not None:
+            self.disk_cache.close()
+            self.disk_cache = None
+    
+    async def login(self) -> bool:
         """Login to Open Library with bot credentials."""
-        logging.info(f"Attempting to login as {self.username}...")
+        logging.info("Attempting to login as %s...", self.username)
         
         login_url = f"{self.base_url}/account/login"
         
@@ -53,10 +331,15 @@ class OpenLibraryBot:
             'redirect': '/'
         }
         
+        self._ensure_client()
+        
         try:
-            response = self.session.post(login_url, data=login_data)
+            response = await self._request('POST', login_url, data=login_data)
+            
+            # Open Library only sets the session cookie on a successful login
+            session_cookie = next((cookie.value for cookie in self.client.cookie_jar if cookie.key == 'session'), '')
             
-            if response.status_code == 200 and self.username.lower() in response.text.lower():
+            if response.status == 200 and session_cookie:
                 self.logged_in = True
                 logging.info("Login successful!")
                 return True
@@ -65,222 +348,582 @@ class OpenLibraryBot:
                 return False
                 
         except Exception as e:
-            logging.error(f"Login error: {e}")
+            logging.error("Login error: %s", e)
             return False
     
-    def get_work(self, work_id: str) -> Dict:
+    async def _request(self, method: str, url: str, **kwargs) -> HTTPResult:
+        """
+        Send a request through the rate limiter, retrying throttled requests.
+        
+        Responses with a status in RETRY_STATUSES are retried with exponential
+        backoff up to MAX_RETRIES times. The body is read while the connection
+        is still held, since aiohttp cannot read a released response.
+        
+        Args:
+            method: HTTP method
+            url: Request URL
+            **kwargs: Passed on to aiohttp.ClientSession.request
+            
+        Returns:
+            Status, headers and body of the last response received
+        """
+        host = urlsplit(url).hostname
+        
+        for attempt in range(MAX_RETRIES + 1):
+            await self.limiter.acquire(host)
+            try:
+                async with self.client.request(method, url, **kwargs) as response:
+                    response = HTTPResult(response.status, response.headers, await response.read())
+                    self.limiter.update(host, response.headers)
+            finally:
+                self.limiter.release(host)
+            
+            if response.status not in RETRY_STATUSES or attempt == MAX_RETRIES:
+                return response
+            
+            backoff = 2 ** attempt + random.uniform(0, 1)
+            logging.warning("%s %s returned %d, retrying in %.1fs (%d/%d)",
+                            method, url, response.status, backoff, attempt + 1, MAX_RETRIES)
+            await asyncio.sleep(backoff)
+    
+    async def get_work(self, work_id: str, refresh: bool = False) -> Dict:
         """
         Fetch work data from Open Library.
         
         Args:
-            work_id: The work ID (e.g., 'OL39584341W' or '/works/OL39584341W')
+            work_id: The work ID, without /works/ prefix (e.g., 'OL39584341W')
+            refresh: If True, skip the caches and fetch the work from the server
             
         Returns:
             Dictionary containing work data
         """
-        # Clean up work_id - remove /works/ prefix if present
-        if work_id.startswith('/works/'):
-            work_id = work_id.replace('/works/', '')
+        if not refresh and self.disk_cache is not None:
+            cached = self.disk_cache.get_many([work_id]).get(work_id)
+            if cached is not None:
+                self._from_disk.add(work_id)
+                return cached
+        
+        # Another task is already fetching this work, share its result
+        inflight = self._inflight.get(work_id)
+        if inflight is not None:
+            return await inflight
+        
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[work_id] = future
         
-        url = f"{self.base_url}/works/{work_id}.json"
+        url = self._work_url(work_id)
+        work_data = None
         
         try:
-            response = self.session.get(url)
+            response = await self._request('GET', url)
             response.raise_for_status()
-            return response.json()
+            work_data = orjson.loads(response.body)
+            self._from_disk.discard(work_id)
+            if self.disk_cache is not None:
+                self.disk_cache.put_many({work_id: work_data})
         except Exception as e:
-            logging.error(f"Error fetching work {work_id}: {e}")
-            return None
+            logging.error("Error fetching work %s: %s", work_id, e)
+        finally:
+            future.set_result(work_data)
+            del self._inflight[work_id]
+        
+        return work_data
+    
+    async def fetch_works_batch(self, work_ids: List[str], refresh: bool = False) -> Dict[str, Dict]:
+        """
+        Fetch several works in a single request via /api/get_many.
+        
+        Args:
+            work_ids: Work IDs (without /works/ prefix)
+            refresh: If True, skip the caches and fetch all works from the server
+            
+        Returns:
+            Dictionary mapping work ID (without prefix) to work data. Works
+            the server did not return are missing from it.
+        """
+        works = {}
+        missing = list(work_ids)
+        
+        if self.disk_cache is not None and not refresh:
+            from_disk = self.disk_cache.get_many(missing)
+            self._from_disk.update(from_disk)
+            works.update(from_disk)
+            missing = [work_id for work_id in missing if work_id not in from_disk]
+        
+        if not missing:
+            return works
+        
+        keys = [f"/works/{work_id}" for work_id in missing]
+        
+        url = f"{self.base_url}/api/get_many"
+        
+        try:
+            response = await self._request('GET', url, params={'keys': orjson.dumps(keys).decode()})
+            response.raise_for_status()
+            data = orjson.loads(response.body)
+        except Exception as e:
+            logging.error("Error fetching batch of %d works: %s", len(keys), e)
+            return works
+        
+        if data.get('status') != 'ok':
+            logging.error("Error fetching batch of %d works: %s", len(keys), data)
+            return works
+        
+        fetched = {self._norm_id(key): work_data for key, work_data in data.get('result', {}).items()}
+        self._from_disk.difference_update(fetched)
+        if self.disk_cache is not None:
+            self.disk_cache.put_many(fetched)
+        works.update(fetched)
+        
+        return works
     
-    def remove_duplicate_authors(self, authors: List[Dict]) -> tuple[List[Dict], int]:
+    @staticmethod
+    def _author_key(author_entry) -> str:
+        """Return the author key of an authors entry, or '' if it has none."""
+        # Handle different author formats
+        if not isinstance(author_entry, dict):
+            return ''
+        if 'author' in author_entry:
+            author = author_entry['author']
+            return author.get('key', '') if isinstance(author, dict) else ''
+        return author_entry.get('key', '')
+    
+    def remove_duplicate_authors(self, authors: List[Dict], out: Optional[List[Dict]] = None,
+                                 seen: Optional[Set[str]] = None) -> tuple[List[Dict], int]:
         """
         Remove duplicate authors from the authors list.
         
+        Entries without an author key are dropped along with the duplicates.
+        
         Args:
             authors: List of author dictionaries with 'author' key containing {'key': '/authors/OL123A'}
+            out: Empty list to collect the cleaned authors in (None = new list)
+            seen: Empty set to use as scratch space (None = new set)
             
         Returns:
-            Tuple of (cleaned authors list, number of duplicates removed)
+            Tuple of (cleaned authors list, number of duplicates removed).
+            When there is nothing to remove, `authors` itself is returned.
         """
-        seen_authors = set()
-        cleaned_authors = []
+        author_keys = [self._author_key(author_entry) for author_entry in authors]
+        seen_authors = set() if seen is None else seen
+        
+        # Fast path: every entry has a key and none repeats
+        seen_authors.update(author_keys)
+        if '' not in seen_authors and len(seen_authors) == len(author_keys):
+            return authors, 0
+        seen_authors.clear()
+        
+        cleaned_authors = [] if out is None else out
         duplicates_removed = 0
+        log_debug = logging.getLogger().isEnabledFor(logging.DEBUG)
         
-        for author_entry in authors:
-            # Handle different author formats
-            if isinstance(author_entry, dict):
-                if 'author' in author_entry:
-                    author_key = author_entry['author'].get('key', '')
-                elif 'key' in author_entry:
-                    author_key = author_entry.get('key', '')
-                else:
-                    continue
-            else:
+        for author_entry, author_key in zip(authors, author_keys):
+            if not author_key:
                 continue
-            
-            if author_key and author_key not in seen_authors:
+            if author_key in seen_authors:
+                duplicates_removed += 1
+                if log_debug:
+                    logging.debug("Removing duplicate author: %s", author_key)
+            else:
                 seen_authors.add(author_key)
                 cleaned_authors.append(author_entry)
-            elif author_key in seen_authors:
-                duplicates_removed += 1
-                logging.debug(f"Removing duplicate author: {author_key}")
         
         return cleaned_authors, duplicates_removed
     
-    def update_work(self, work_id: str, work_data: Dict, comment: str) -> bool:
+    def _forget_work(self, work_id: str):
+        """Drop a work from the disk cache."""
+        self._from_disk.discard(work_id)
+        if self.disk_cache is not None:
+            self.disk_cache.delete(work_id)
+    
+    async def update_work(self, work_id: str, work_data: Dict, cleaned_authors: List[Dict], comment: str) -> bool:
         """
         Update a work on Open Library.
         
         Args:
             work_id: The work ID (without /works/ prefix)
-            work_data: Updated work data
+            work_data: Fetched work data, left unmodified
+            cleaned_authors: Authors list to save in place of the fetched one
             comment: Edit comment explaining the change
             
+        The full document is sent, since Open Library replaces the stored
+        work with the PUT body. When the fetched data carries a revision it is
+        sent as `If-Match`, so an edit made since the fetch is not overwritten.
+        
         Returns:
             True if update successful, False otherwise
         """
-        # Clean up work_id
-        if work_id.startswith('/works/'):
-            work_id = work_id.replace('/works/', '')
-        
         if self.dry_run:
-            logging.info(f"[DRY RUN] Would update work {work_id}")
+            logging.info("[DRY RUN] Would update work %s", work_id)
             return True
         
-        url = f"{self.base_url}/works/{work_id}.json"
+        url = self._work_url(work_id)
+        
+        # Build the new document without touching the fetched work data
+        payload = dict(work_data, authors=cleaned_authors, _comment=comment)
         
-        # Add edit comment
-        work_data['_comment'] = comment
+        headers = {'Content-Type': 'application/json'}
+        revision = work_data.get('revision')
+        if revision is not None:
+            headers['If-Match'] = f'"{revision}"'
         
         try:
-            response = self.session.put(
+            response = await self._request(
+                'PUT',
                 url,
-                json=work_data,
-                headers={'Content-Type': 'application/json'}
+                data=orjson.dumps(payload),
+                headers=headers
             )
             
-            if response.status_code == 200:
-                logging.info(f"Successfully updated work {work_id}")
+            if response.status == 200:
+                logging.info("Successfully updated work %s", work_id)
+                # Cached copies no longer match the server
+                self._forget_work(work_id)
                 return True
+            elif response.status == 412:
+                logging.warning("Work %s changed since revision %s was fetched, not updating it",
+                                work_id, revision)
+                self._forget_work(work_id)
+                return False
             else:
-                logging.error(f"Failed to update work {work_id}: Status {response.status_code}")
-                logging.error(f"Response: {response.text}")
+                logging.error("Failed to update work %s: Status %d", work_id, response.status)
+                logging.error("Response: %s", response.text())
                 return False
                 
         except Exception as e:
-            logging.error(f"Error updating work {work_id}: {e}")
+            logging.error("Error updating work %s: %s", work_id, e)
             return False
     
-    def process_work(self, work_id: str) -> bool:
+    def _diff_work(self, work_id: str, work_data: Optional[Dict]) -> Optional[tuple[List[Dict], int]]:
         """
-        Process a single work to remove duplicate authors.
+        Work out the cleaned authors list of a fetched work.
         
         Args:
-            work_id: The work ID to process (can include /works/ prefix)
+            work_id: The work ID (without /works/ prefix)
+            work_data: Fetched work data, or None if it could not be fetched
             
         Returns:
-            True if successful, False otherwise
+            Tuple of (cleaned authors list, number of duplicates removed), or
+            None if the work is skipped. The cleaned list is pooled, and
+            `_push_update` hands it back once the work has been saved.
         """
-        # Clean work_id for display
-        display_id = work_id.replace('/works/', '') if work_id.startswith('/works/') else work_id
-        
-        logging.info(f"\nProcessing work: {display_id}")
-        
-        # Fetch current work data
-        work_data = self.get_work(work_id)
+        logging.info("\nProcessing work: %s", work_id)
         
         if not work_data:
-            logging.warning(f"Could not fetch work {display_id}, skipping...")
+            logging.warning("Could not fetch work %s, skipping...", work_id)
             self.stats['skipped_works'] += 1
-            return False
+            return None
         
         # Check if work has authors
         if 'authors' not in work_data or not work_data['authors']:
-            logging.warning(f"Work {display_id} has no authors field, skipping...")
+            logging.warning("Work %s has no authors field, skipping...", work_id)
             self.stats['skipped_works'] += 1
-            return False
+            return None
         
-        original_author_count = len(work_data['authors'])
-        logging.info(f"Original author count: {original_author_count}")
+        authors = work_data['authors']
+        logging.info("Original author count: %d", len(authors))
         
-        # Remove duplicates
-        cleaned_authors, duplicates_removed = self.remove_duplicate_authors(work_data['authors'])
+        # Remove duplicates, using pooled scratch structures
+        buffer = self._list_pool.popleft() if self._list_pool else []
+        seen = self._set_pool.popleft() if self._set_pool else set()
+        cleaned_authors, duplicates_removed = self.remove_duplicate_authors(authors, out=buffer, seen=seen)
+        self._release(self._set_pool, seen)
         
-        if duplicates_removed == 0:
-            logging.info(f"No duplicates found in work {display_id}, skipping...")
+        # The authors list itself comes back when the fast path found nothing to remove
+        if cleaned_authors is authors or duplicates_removed == 0:
+            self._release(self._list_pool, buffer)
+            logging.info("No duplicates found in work %s, skipping...", work_id)
             self.stats['skipped_works'] += 1
-            return False
+            return None
         
-        logging.info(f"Removed {duplicates_removed} duplicate author(s)")
-        logging.info(f"New author count: {len(cleaned_authors)}")
+        logging.info("Removed %d duplicate author(s)", duplicates_removed)
+        logging.info("New author count: %d", len(cleaned_authors))
         
-        # Update work data
-        work_data['authors'] = cleaned_authors
+        return cleaned_authors, duplicates_removed
+    
+    async def _push_update(self, work_id: str, work_data: Dict, cleaned_authors: List[Dict],
+                           duplicates_removed: int) -> bool:
+        """
+        Save the cleaned authors list of a work and record the outcome.
         
+        Args:
+            work_id: The work ID (without /works/ prefix)
+            work_data: Fetched work data
+            cleaned_authors: Authors list returned by `_diff_work`
+            duplicates_removed: Number of duplicates removed from it
+            
+        Returns:
+            True if successful, False otherwise
+        """
         # Update the work
         comment = f"Removed {duplicates_removed} duplicate author entry(ies) - Bot automated cleanup"
         
-        success = self.update_work(work_id, work_data, comment)
+        try:
+            success = await self.update_work(work_id, work_data, cleaned_authors, comment)
+        finally:
+            # The update is done with the pooled list, so it can be reused
+            self._release(self._list_pool, cleaned_authors)
         
         if success:
             self.stats['successful_updates'] += 1
             self.stats['authors_removed'] += duplicates_removed
+            if self._done_fh is not None:
+                print(work_id, file=self._done_fh, flush=True)
         else:
             self.stats['failed_updates'] += 1
         
         return success
     
-    def process_all_works(self, json_file: str, delay: float = 2.0, max_works: int = None):
+    @staticmethod
+    def _release(pool: deque, scratch):
+        """Clear a scratch list or set and return it to its pool."""
+        scratch.clear()
+        pool.append(scratch)
+    
+    @staticmethod
+    def _report_has_duplicates(item: Dict) -> bool:
         """
-        Process all works from the duplicate authors JSON file.
+        Check whether a report entry lists duplicate authors for its work.
+        
+        Args:
+            item: Entry from the duplicate authors JSON file
+            
+        Returns:
+            False if the entry's `duplicate_author_ids` or `all_authors` show
+            no duplicates, True otherwise (including when neither is present)
+        """
+        if 'duplicate_author_ids' in item:
+            return bool(item['duplicate_author_ids'])
+        
+        all_authors = item.get('all_authors')
+        if isinstance(all_authors, list):
+            try:
+                return len(set(all_authors)) < len(all_authors)
+            except TypeError:
+                return True
+        
+        return True
+    
+    async def _fetch_works(self, work_ids: List[str], refresh: bool = False) -> Dict[str, Optional[Dict]]:
+        """
+        Fetch works in one batch, trying those the batch left out on their own.
+        
+        Args:
+            work_ids: Work IDs (without /works/ prefix)
+            refresh: If True, skip the caches and fetch all works from the server
+            
+        Returns:
+            Dictionary mapping every work ID to its data, or None if it could not be fetched
+        """
+        works = await self.fetch_works_batch(work_ids, refresh=refresh)
+        
+        missing = [work_id for work_id in work_ids if work_id not in works]
+        if missing:
+            fetched = await asyncio.gather(*(self.get_work(work_id, refresh=refresh) for work_id in missing))
+            works.update(zip(missing, fetched))
+        
+        return works
+    
+    def _has_duplicates(self, work_data: Optional[Dict]) -> bool:
+        """Check, without logging or counting anything, whether a work has duplicate authors."""
+        authors = work_data.get('authors') if work_data else None
+        if not authors:
+            return False
+        author_keys = [author_key for author_key in map(self._author_key, authors) if author_key]
+        return len(set(author_keys)) < len(author_keys)
+    
+    async def _process_batch(self, batch: List[str]):
+        """
+        Fetch a batch of works in one request, then update those with duplicates.
+        
+        Work IDs are expected without /works/ prefix, as queued by `_queue_work_ids`.
+        
+        The updates of a batch are independent of each other, so they are
+        sent concurrently once every work in the batch has been checked.
+        """
+        works = await self._fetch_works(batch)
+        
+        updates = []
+        stale = []
+        for work_id in batch:
+            self._processed += 1
+            logging.info("Progress: %d/%d", self._processed, self.stats['total_works'])
+            # A copy cached by an earlier run may be outdated, only edit fresh data
+            if work_id in self._from_disk and self._has_duplicates(works[work_id]):
+                stale.append(work_id)
+                continue
+            diff = self._diff_work(work_id, works[work_id])
+            if diff is not None:
+                updates.append((work_id, works[work_id], *diff))
+        
+        if stale:
+            logging.info("Refetching %d cached work(s) before editing them", len(stale))
+            fresh = await self._fetch_works(stale, refresh=True)
+            for work_id in stale:
+                diff = self._diff_work(work_id, fresh[work_id])
+                if diff is not None:
+                    updates.append((work_id, fresh[work_id], *diff))
+        
+        # One failing update must not abandon the rest of the batch
+        results = await asyncio.gather(*(self._push_update(*update) for update in updates),
+                                       return_exceptions=True)
+        for (work_id, *_), result in zip(updates, results):
+            if isinstance(result, BaseException):
+                logging.error("Unexpected error updating work %s: %s", work_id, result)
+        
+        # Nothing about these works is needed again, keep memory bounded by the queue
+        for work_id in batch:
+            self._from_disk.discard(work_id)
+            self._url_cache.pop(work_id, None)
+        
+        # One commit for all the cache writes of the batch
+        if self.disk_cache is not None:
+            self.disk_cache.commit()
+        
+        # Make sure the checkpoint of this batch survives a crash
+        if self._done_fh is not None and updates:
+            await asyncio.to_thread(os.fsync, self._done_fh.fileno())
+    
+    async def _process_queue(self, work_queue: asyncio.Queue):
+        """
+        Take work IDs off the queue in batches of up to BATCH_SIZE and process them.
+        
+        Stops after taking a None sentinel off the queue.
+        """
+        stop = False
+        while not stop:
+            work_id = await work_queue.get()
+            if work_id is None:
+                return
+            
+            batch = [work_id]
+            while len(batch) < BATCH_SIZE:
+                try:
+                    work_id = work_queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    break
+                if work_id is None:
+                    stop = True
+                    break
+                batch.append(work_id)
+            
+            try:
+                await self._process_batch(batch)
+            except Exception as e:
+                logging.error("Unexpected error processing batch starting at %s: %s", batch[0], e)
+    
+    async def _queue_work_ids(self, json_file: str, work_queue: asyncio.Queue, max_works: int = None,
+                              done: Optional[Set[str]] = None):
+        """
+        Stream work IDs from the JSON file into the queue as they are parsed.
+        
+        Entries the report itself shows to be free of duplicates, works
+        already queued, and works updated by an earlier run are left out.
         
         Args:
             json_file: Path to the JSON file with duplicate authors
-            delay: Delay in seconds between requests (rate limiting)
-            max_works: Maximum number of works to process (None = all)
+            work_queue: Queue the work IDs are put on
+            max_works: Maximum number of works to queue (None = all)
+            done: Work IDs updated by an earlier run
         """
-        logging.info(f"Loading duplicate authors from {json_file}...")
+        entries = 0
+        report_clean = 0
+        repeated = 0
+        already_done = 0
+        queued = 0
+        seen = set()
+        done = done or set()
         
         try:
-            with open(json_file, 'r') as f:
-                duplicate_data = json.load(f)
+            with open(json_file, 'rb') as f:
+                for item in ijson.items(f, 'item'):
+                    entries += 1
+                    
+                    if 'work_id' not in item:
+                        logging.warning("Entry missing 'work_id' field: %s", item)
+                        continue
+                    if not self._report_has_duplicates(item):
+                        report_clean += 1
+                        continue
+                    
+                    # The same work can be reported several times, process it once
+                    work_id = self._norm_id(item['work_id'])
+                    if work_id in seen:
+                        repeated += 1
+                        continue
+                    seen.add(work_id)
+                    
+                    if work_id in done:
+                        already_done += 1
+                        continue
+                    
+                    queued += 1
+                    self.stats['total_works'] += 1
+                    await work_queue.put(work_id)
+                    
+                    if max_works and queued >= max_works:
+                        logging.info("Processing first %d works only (test mode)", max_works)
+                        break
         except Exception as e:
-            logging.error(f"Error loading JSON file: {e}")
-            return
+            logging.error("Error loading JSON file: %s", e)
+        
+        if not entries:
+            logging.error("Expected JSON to be a non-empty list of entries")
+        
+        logging.info("Loaded %d entries from JSON", entries)
+        if report_clean:
+            logging.info("Skipped %d entries that list no duplicate authors", report_clean)
+        if repeated:
+            logging.info("Dropped %d repeated work entries", repeated)
+        if already_done:
+            logging.info("Skipped %d works already updated by an earlier run", already_done)
+        logging.info("Found %d works to process", queued)
+    
+    def _load_done(self) -> Set[str]:
+        """Read the work IDs recorded in `self.done_file` by earlier runs."""
+        if not self.done_file or not Path(self.done_file).exists():
+            return set()
+        return set(Path(self.done_file).read_text().splitlines())
+    
+    async def process_all_works_async(self, json_file: str, max_works: int = None):
+        """
+        Process all works from the duplicate authors JSON file.
         
-        # Handle list format (which is what you have)
-        if not isinstance(duplicate_data, list):
-            logging.error(f"Expected JSON to be a list, got {type(duplicate_data)}")
-            return
+        The file is parsed incrementally and its work IDs are fed through a
+        queue to `self.concurrency` workers, which fetch and process them in
+        batches of BATCH_SIZE while the rest of the file is still being read.
         
-        logging.info(f"Loaded {len(duplicate_data)} entries from JSON")
+        In live mode, every updated work is appended to `self.done_file`, and
+        works listed there are skipped, so an interrupted run can be resumed.
         
-        # Extract work IDs from the list
-        work_ids = []
-        for item in duplicate_data:
-            if 'work_id' in item:
-                work_ids.append(item['work_id'])
-            else:
-                logging.warning(f"Entry missing 'work_id' field: {item}")
+        Args:
+            json_file: Path to the JSON file with duplicate authors
+            max_works: Maximum number of works to process (None = all)
+        """
+        logging.info("Loading duplicate authors from %s...", json_file)
+        logging.info("Mode: %s", 'DRY RUN (no actual changes)' if self.dry_run else 'LIVE (will make changes)')
+        logging.info("Starting processing...\n")
         
-        self.stats['total_works'] = len(work_ids)
+        self._ensure_client()
         
-        if max_works:
-            work_ids = work_ids[:max_works]
-            logging.info(f"Processing first {max_works} works only (test mode)")
+        done = self._load_done()
+        if self.done_file and not self.dry_run:
+            self._done_fh = open(self.done_file, 'a')
         
-        logging.info(f"Found {len(work_ids)} works to process")
-        logging.info(f"Mode: {'DRY RUN (no actual changes)' if self.dry_run else 'LIVE (will make changes)'}")
-        logging.info("Starting processing...\n")
+        # Bounded so parsing only runs ahead of the workers by a few batches
+        work_queue: asyncio.Queue = asyncio.Queue(maxsize=self.concurrency * BATCH_SIZE)
+        workers = [asyncio.create_task(self._process_queue(work_queue)) for _ in range(self.concurrency)]
         
-        for idx, work_id in enumerate(work_ids, 1):
-            logging.info(f"Progress: {idx}/{len(work_ids)}")
-            
-            self.process_work(work_id)
+        try:
+            await self._queue_work_ids(json_file, work_queue, max_works, done)
+        finally:
+            for _ in workers:
+                await work_queue.put(None)
+            await asyncio.gather(*workers)
             
-            # Rate limiting
-            if idx < len(work_ids):  # Don't delay after last work
-                time.sleep(delay)
+            if self._done_fh is not None:
+                self._done_fh.close()
+                self._done_fh = None
         
         # Print final statistics
         self.print_statistics()
@@ -290,14 +933,35 @@ class OpenLibraryBot:
         logging.info("\n" + "="*50)
         logging.info("FINAL STATISTICS")
         logging.info("="*50)
-        logging.info(f"Total works processed: {self.stats['total_works']}")
-        logging.info(f"Successful updates: {self.stats['successful_updates']}")
-        logging.info(f"Failed updates: {self.stats['failed_updates']}")
-        logging.info(f"Skipped works: {self.stats['skipped_works']}")
-        logging.info(f"Total duplicate authors removed: {self.stats['authors_removed']}")
+        logging.info("Total works processed: %d", self.stats['total_works'])
+        logging.info("Successful updates: %d", self.stats['successful_updates'])
+        logging.info("Failed updates: %d", self.stats['failed_updates'])
+        logging.info("Skipped works: %d", self.stats['skipped_works'])
+        logging.info("Total duplicate authors removed: %d", self.stats['authors_removed'])
         logging.info("="*50)
 
 
+async def run_bot(bot: OpenLibraryBot, json_file: str, max_works: int = None) -> bool:
+    """
+    Login and process all works, closing the bot's HTTP session afterwards.
+    
+    Returns:
+        False if login failed, True otherwise
+    """
+    async with bot:
+        # Login
+        if not await bot.login():
+            print("Failed to login. Please check credentials.")
+            return False
+        
+        # Process all works
+        await bot.process_all_works_async(
+            json_file=json_file,
+            max_works=max_works
+        )
+        return True
+
+
 def main():
     """Main function to run the bot."""
     
@@ -306,8 +970,10 @@ def main():
     BOT_PASSWORD = "your_bot_password_here"  # TODO: Replace with your bot password
     JSON_FILE = "duplicate_authors.json"      # Path to the JSON file
     DRY_RUN = True                            # Set to False to make actual changes
-    DELAY_BETWEEN_REQUESTS = 2.0              # Seconds between requests
+    MAX_CONCURRENT_REQUESTS = 10              # Workers (batches of BATCH_SIZE works) and requests per host
     MAX_WORKS_TO_PROCESS = 10                 # Set to None to process all, or a number for testing
+    CACHE_FILE = "ol_cache.sqlite"            # Works fetched in earlier runs (None = disable)
+    DONE_FILE = "done.txt"                    # Works updated in earlier runs, skipped (None = disable)
     
     print("="*70)
     print("Open Library Duplicate Authors Removal Bot")
@@ -327,21 +993,15 @@ def main():
     bot = OpenLibraryBot(
         username=BOT_USERNAME,
         password=BOT_PASSWORD,
-        dry_run=DRY_RUN
+        dry_run=DRY_RUN,
+        concurrency=MAX_CONCURRENT_REQUESTS,
+        cache_file=CACHE_FILE,
+        done_file=DONE_FILE
     )
     
-    # Login
-    if not bot.login():
-        print("Failed to login. Please check credentials.")
+    if not asyncio.run(run_bot(bot, JSON_FILE, MAX_WORKS_TO_PROCESS)):
         return
     
-    # Process all works
-    bot.process_all_works(
-        json_file=JSON_FILE,
-        delay=DELAY_BETWEEN_REQUESTS,
-        max_works=MAX_WORKS_TO_PROCESS
-    )
-    
     print("\nBot execution completed!")
 
 
@@ -0,0 +1,374 @@
+import asyncio
+import importlib
+import json
+import logging
+import time
+from email.utils import formatdate
+
+import orjson
+import pytest
+from aiohttp import web
+
+
+def author(key):
+    return {'author': {'key': key}, 'type': {'key': '/type/author_role'}}
+
+
+class FakeOpenLibrary:
+    """Minimal stand-in for the Open Library endpoints the bot uses."""
+
+    def __init__(self, works, batch_omits=(), failures=()):
+        self.works = works
+        self.batch_omits = set(batch_omits)
+        # Statuses returned, in order, by the first single-work GETs
+        self.failures = list(failures)
+        self.puts = {}
+        self.requests = []
+
+    def app(self):
+        app = web.Application()
+        app.router.add_post('/account/login', self.login)
+        app.router.add_get('/api/get_many', self.get_many)
+        app.router.add_get('/works/{work_id}.json', self.get_work)
+        app.router.add_put('/works/{work_id}.json', self.put_work)
+        return app
+
+    async def login(self, request):
+        self.requests.append(('POST', request.path))
+        response = web.Response(text='<html>logged in</html>')
+        response.set_cookie('session', '/people/bot,2025,abc')
+        return response
+
+    async def get_many(self, request):
+        self.requests.append(('GET', request.path))
+        keys = json.loads(request.query['keys'])
+        result = {
+            key: self.works[key[len('/works/'):]]
+            for key in keys
+            if key[len('/works/'):] in self.works and key[len('/works/'):] not in self.batch_omits
+        }
+        return web.json_response({'status': 'ok', 'result': result})
+
+    async def get_work(self, request):
+        work_id = request.match_info['work_id']
+        self.requests.append(('GET', request.path))
+        if self.failures:
+            return web.Response(status=self.failures.pop(0), headers={'Retry-After': '0'})
+        if work_id not in self.works:
+            raise web.HTTPNotFound()
+        return web.json_response(self.works[work_id])
+
+    async def put_work(self, request):
+        work_id = request.match_info['work_id']
+        self.requests.append(('PUT', request.path))
+        data = orjson.loads(await request.read())
+        self.puts[work_id] = data
+        self.works[work_id] = {k: v for k, v in data.items() if k != '_comment'}
+        return web.json_response({'key': f'/works/{work_id}'})
+
+
+@pytest.fixture
+def bot_module(tmp_path, monkeypatch):
+    # The module opens its log file on import, keep it out of the repo
+    monkeypatch.chdir(tmp_path)
+    return importlib.import_module('remove_duplicate_authors')
+
+
+def write_report(path, work_ids):
+    entries = [
+        {'work_id': f'/works/{work_id}', 'duplicate_author_ids': ['/authors/OL1A']}
+        for work_id in work_ids
+    ]
+    path.write_text(json.dumps(entries))
+    return str(path)
+
+
+async def start_server(bot_module, server, dry_run, **kwargs):
+    runner = web.AppRunner(server.app())
+    await runner.setup()
+    site = web.TCPSite(runner, '127.0.0.1', 0)
+    await site.start()
+    port = runner.addresses[0][1]
+
+    bot = bot_module.OpenLibraryBot('bot', 'secret', dry_run=dry_run, **kwargs)
+    # Cookies set by bare IP hosts are rejected by aiohttp's cookie jar
+    bot.base_url = f'http://localhost:{port}'
+    return runner, bot
+
+
+async def run_bot(bot_module, server, report, dry_run, **kwargs):
+    runner, bot = await start_server(bot_module, server, dry_run, **kwargs)
+    try:
+        assert await bot_module.run_bot(bot, report)
+    finally:
+        await runner.cleanup()
+    return bot
+
+
+def test_fetch_and_update_round(bot_module, tmp_path):
+    server = FakeOpenLibrary({
+        'OL1W': {'key': '/works/OL1W', 'revision': 3, 'title': 'One',
+                 'authors': [author('/authors/OL1A'), author('/authors/OL1A')]},
+        'OL2W': {'key': '/works/OL2W', 'revision': 1, 'title': 'Two',
+                 'authors': [author('/authors/OL2A')]},
+        'OL3W': {'key': '/works/OL3W', 'revision': 7, 'title': 'Three',
+                 'authors': [author('/authors/OL3A'), author('/authors/OL4A'), author('/authors/OL3A')]},
+    }, batch_omits={'OL3W'})
+    report = write_report(tmp_path / 'report.json', ['OL1W', 'OL2W', 'OL3W'])
+
+    bot = asyncio.run(run_bot(bot_module, server, report, dry_run=False))
+
+    assert set(server.puts) == {'OL1W', 'OL3W'}
+    assert server.puts['OL1W']['authors'] == [author('/authors/OL1A')]
+    assert server.puts['OL1W']['title'] == 'One'
+    assert server.puts['OL1W']['_comment'].startswith('Removed 1 duplicate')
+    assert server.puts['OL3W']['authors'] == [author('/authors/OL3A'), author('/authors/OL4A')]
+    assert ('GET', '/works/OL3W.json') in server.requests
+    assert bot.stats['successful_updates'] == 2
+    assert bot.stats['skipped_works'] == 1
+    assert bot.stats['failed_updates'] == 0
+
+
+def test_cached_works_are_refetched_before_editing(bot_module, tmp_path, caplog):
+    server = FakeOpenLibrary({
+        'OL1W': {'key': '/works/OL1W', 'revision': 3, 'title': 'One',
+                 'authors': [author('/authors/OL1A'), author('/authors/OL1A')]},
+        'OL3W': {'key': '/works/OL3W', 'revision': 7, 'title': 'Three',
+                 'authors': [author('/authors/OL3A'), author('/authors/OL3A')]},
+    }, batch_omits={'OL3W'})
+    report = write_report(tmp_path / 'report.json', ['OL1W', 'OL3W'])
+    cache_file = str(tmp_path / 'cache.sqlite')
+
+    # A dry run fills the disk cache without editing anything
+    asyncio.run(run_bot(bot_module, server, report, dry_run=True, cache_file=cache_file))
+    assert server.puts == {}
+
+    server.requests.clear()
+    caplog.clear()
+    caplog.set_level(logging.INFO)
+    bot = asyncio.run(run_bot(bot_module, server, report, dry_run=False, cache_file=cache_file))
+
+    assert set(server.puts) == {'OL1W', 'OL3W'}
+    assert ('GET', '/works/OL3W.json') in server.requests
+    assert bot.stats['successful_updates'] == 2
+    processing = [record.getMessage() for record in caplog.records if 'Processing work' in record.getMessage()]
+    assert len(processing) == 2
+
+
+def test_limiter_spreads_remaining_budget_over_reset_window(bot_module):
+    async def check():
+        limiter = bot_module.AdaptiveLimiter()
+        limiter.update('example.org', {'X-RateLimit-Remaining': '10', 'X-RateLimit-Reset': '20'})
+        assert limiter._intervals['example.org'] == pytest.approx(2.0)
+
+        # Epoch-style reset timestamps are turned into seconds from now
+        reset_at = str(int(time.time()) + 40)
+        limiter.update('example.com', {'X-RateLimit-Remaining': '20', 'X-RateLimit-Reset': reset_at})
+        assert limiter._intervals['example.com'] == pytest.approx(2.0, abs=0.1)
+
+        now = asyncio.get_running_loop().time()
+        limiter.update('example.net', {'X-RateLimit-Remaining': '0', 'X-RateLimit-Reset': '30'})
+        assert limiter._deadlines['example.net'] == pytest.approx(now + 30, abs=1)
+
+        # Malformed values leave the pacing alone
+        limiter.update('example.edu', {'X-RateLimit-Remaining': 'many', 'X-RateLimit-Reset': '30'})
+        assert 'example.edu' not in limiter._intervals
+
+    asyncio.run(check())
+
+
+def test_limiter_honours_retry_after(bot_module):
+    async def check():
+        limiter = bot_module.AdaptiveLimiter()
+        now = asyncio.get_running_loop().time()
+        limiter.update('example.org', {'Retry-After': '15'})
+        assert limiter._deadlines['example.org'] == pytest.approx(now + 15, abs=1)
+
+        limiter.update('example.com', {'Retry-After': formatdate(time.time() + 60, usegmt=True)})
+        assert limiter._deadlines['example.com'] == pytest.approx(now + 60, abs=2)
+
+        limiter.update('example.net', {'Retry-After': 'soon'})
+        assert limiter._deadlines['example.net'] == 0.0
+
+    asyncio.run(check())
+
+
+def test_limiter_frees_slot_when_cancelled_while_waiting(bot_module):
+    async def check():
+        limiter = bot_module.AdaptiveLimiter(max_concurrent=1)
+        limiter.update('example.org', {'Retry-After': '60'})
+        waiter = asyncio.create_task(limiter.acquire('example.org'))
+        await asyncio.sleep(0)
+        waiter.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+
+        limiter._deadlines['example.org'] = 0.0
+        await asyncio.wait_for(limiter.acquire('example.org'), timeout=1)
+        limiter.release('example.org')
+
+    asyncio.run(check())
+
+
+def test_request_retries_throttled_responses(bot_module, monkeypatch):
+    server = FakeOpenLibrary({
+        'OL1W': {'key': '/works/OL1W', 'revision': 1, 'authors': []},
+    }, failures=[429, 503])
+    delays = []
+    real_sleep = asyncio.sleep
+
+    async def fake_sleep(delay, *args, **kwargs):
+        delays.append(delay)
+        await real_sleep(0)
+
+    monkeypatch.setattr(bot_module.random, 'uniform', lambda a, b: 0.0)
+
+    async def check():
+        runner, bot = await start_server(bot_module, server, dry_run=True)
+        monkeypatch.setattr(bot_module.asyncio, 'sleep', fake_sleep)
+        try:
+            async with bot:
+                return await bot.get_work('OL1W')
+        finally:
+            monkeypatch.setattr(bot_module.asyncio, 'sleep', real_sleep)
+            await runner.cleanup()
+
+    work = asyncio.run(check())
+
+    assert work == server.works['OL1W']
+    assert server.requests.count(('GET', '/works/OL1W.json')) == 3
+    # Exponential backoff between the attempts
+    assert [delay for delay in delays if delay >= 1] == [1, 2]
+
+
+def test_work_cache_commits_per_batch_and_prunes_expired(bot_module, tmp_path):
+    path = str(tmp_path / 'cache.sqlite')
+    cache = bot_module.WorkCache(path)
+    cache.put_many({'OL1W': {'key': '/works/OL1W'}, 'OL2W': {'key': '/works/OL2W'}})
+    cache.delete('OL2W')
+    cache.close()
+
+    cache = bot_module.WorkCache(path)
+    assert cache.get_many(['OL1W', 'OL2W']) == {'OL1W': {'key': '/works/OL1W'}}
+    cache.close()
+
+    # Opening with a shorter expiry drops the older rows from the file
+    time.sleep(0.01)
+    cache = bot_module.WorkCache(path, expire_after=0)
+    assert cache._conn.execute("SELECT COUNT(*) FROM works").fetchone() == (0,)
+    cache.close()
+
+
+def test_resumed_run_skips_recorded_works(bot_module, tmp_path):
+    server = FakeOpenLibrary({
+        'OL1W': {'key': '/works/OL1W', 'revision': 3,
+                 'authors': [author('/authors/OL1A'), author('/authors/OL1A')]},
+        'OL3W': {'key': '/works/OL3W', 'revision': 7,
+                 'authors': [author('/authors/OL3A'), author('/authors/OL3A')]},
+    })
+    report = write_report(tmp_path / 'report.json', ['OL1W', 'OL3W'])
+    done_file = tmp_path / 'done.txt'
+
+    asyncio.run(run_bot(bot_module, server, report, dry_run=False, done_file=str(done_file)))
+    assert set(done_file.read_text().split()) == {'OL1W', 'OL3W'}
+
+    server.requests.clear()
+    server.puts.clear()
+    bot = asyncio.run(run_bot(bot_module, server, report, dry_run=False, done_file=str(done_file)))
+
+    assert server.requests == [('POST', '/account/login')]
+    assert server.puts == {}
+    assert bot.stats['total_works'] == 0
+
+
+def test_remove_duplicate_authors_returns_input_without_duplicates(bot_module):
+    bot = bot_module.OpenLibraryBot('bot', 'secret')
+    authors = [author('/authors/OL1A'), {'key': '/authors/OL2A'}]
+
+    cleaned, removed = bot.remove_duplicate_authors(authors)
+
+    assert cleaned is authors
+    assert removed == 0
+
+
+def test_remove_duplicate_authors_drops_keyless_entries_uncounted(bot_module):
+    bot = bot_module.OpenLibraryBot('bot', 'secret')
+    authors = [
+        author('/authors/OL1A'),
+        {'type': {'key': '/type/author_role'}},
+        'not an author',
+        {'author': '/authors/OL1A'},
+        author('/authors/OL1A'),
+        {'key': '/authors/OL2A'},
+    ]
+
+    cleaned, removed = bot.remove_duplicate_authors(authors)
+
+    assert cleaned == [author('/authors/OL1A'), {'key': '/authors/OL2A'}]
+    assert removed == 1
+
+
+def test_remove_duplicate_authors_fills_supplied_scratch(bot_module):
+    bot = bot_module.OpenLibraryBot('bot', 'secret')
+    authors = [author('/authors/OL1A'), author('/authors/OL2A'), author('/authors/OL1A')]
+    out, seen = [], set()
+
+    cleaned, removed = bot.remove_duplicate_authors(authors, out=out, seen=seen)
+
+    assert cleaned is out
+    assert out == [author('/authors/OL1A'), author('/authors/OL2A')]
+    assert removed == 1
+    assert seen == {'/authors/OL1A', '/authors/OL2A'}
+
+
+def test_pooled_authors_list_is_not_shared_between_payloads(bot_module):
+    bot = bot_module.OpenLibraryBot('bot', 'secret', dry_run=False)
+    payloads = []
+
+    async def fake_request(method, url, **kwargs):
+        payloads.append(orjson.loads(kwargs['data']))
+        return bot_module.HTTPResult(200, {}, b'{}')
+
+    bot._request = fake_request
+    first = {'key': '/works/OL1W', 'authors': [author('/authors/OL1A'), author('/authors/OL1A')]}
+    second = {'key': '/works/OL2W', 'authors': [author('/authors/OL2A'), author('/authors/OL3A'),
+                                                author('/authors/OL2A')]}
+
+    async def check():
+        cleaned_first, removed = bot._diff_work('OL1W', first)
+        assert await bot._push_update('OL1W', first, cleaned_first, removed)
+        cleaned_second, removed = bot._diff_work('OL2W', second)
+        # The second work reuses the list released after the first update
+        assert cleaned_second is cleaned_first
+        assert await bot._push_update('OL2W', second, cleaned_second, removed)
+
+    asyncio.run(check())
+
+    assert payloads[0]['authors'] == [author('/authors/OL1A')]
+    assert payloads[1]['authors'] == [author('/authors/OL2A'), author('/authors/OL3A')]
+    assert first['authors'] == [author('/authors/OL1A'), author('/authors/OL1A')]
+
+
+def test_report_entries_without_duplicates_are_not_fetched(bot_module, tmp_path):
+    works = {
+        work_id: {'key': f'/works/{work_id}', 'revision': 1,
+                  'authors': [author('/authors/OL1A'), author('/authors/OL1A')]}
+        for work_id in ('OL1W', 'OL2W', 'OL3W', 'OL4W')
+    }
+    # Omitted from batches so every fetched work shows up as its own GET
+    server = FakeOpenLibrary(works, batch_omits=works)
+    report = tmp_path / 'report.json'
+    report.write_text(json.dumps([
+        {'work_id': '/works/OL1W', 'duplicate_author_ids': []},
+        {'work_id': '/works/OL2W', 'all_authors': ['/authors/OL1A', '/authors/OL2A']},
+        {'work_id': '/works/OL3W'},
+        {'work_id': '/works/OL4W', 'duplicate_author_ids': ['/authors/OL1A']},
+    ]))
+
+    bot = asyncio.run(run_bot(bot_module, server, str(report), dry_run=True))
+
+    assert ('GET', '/works/OL1W.json') not in server.requests
+    assert ('GET', '/works/OL2W.json') not in server.requests
+    assert ('GET', '/works/OL3W.json') in server.requests
+    assert ('GET', '/works/OL4W.json') in server.requests
+    assert bot.stats['total_works'] == 2